@@ -0,0 +1,50 @@
+"""Parsing of multi-image tesseract TSV output (--ocr-batch); canned output, no tesseract binary needed."""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import super_pipeline as sp  # noqa: E402
+
+HEADER = "level\tpage_num\tblock_num\tpar_num\tline_num\tword_num\tleft\ttop\twidth\theight\tconf\ttext"
+
+
+def tsv(*rows):
+    return "\n".join([HEADER] + ["\t".join(str(v) for v in r) for r in rows]) + "\n"
+
+
+def page(n, w=900, h=300):
+    return (1, n, 0, 0, 0, 0, 0, 0, w, h, -1, "")
+
+
+def word(n, x, y, text, conf=91.5):
+    return (5, n, 1, 1, 1, 1, x, y, 40, 20, conf, text)
+
+
+def test_words_are_split_by_page_num():
+    out = tsv(page(1), (2, 1, 1, 0, 0, 0, 10, 10, 200, 30, -1, ""), word(1, 10, 10, "Village"),
+              page(2),
+              page(3), word(3, 50, 60, "Shimla", conf=88))
+    pages = [sp._items_from_tess_data(d) for d in sp._tess_tsv_pages(out, 3)]
+    assert [[it["text"] for it in items] for items in pages] == [["Village"], [], ["Shimla"]]
+    assert pages[2][0]["confidence"] == 88.0
+    assert pages[2][0]["bbox"] == sp.quad_from_xywh(50, 60, 40, 20)
+
+
+def test_rows_are_keyed_on_page_num_not_row_order():
+    # a page row missing for page 1 must not shift page 2's words onto page 1
+    out = tsv(word(1, 10, 10, "a"), page(2), word(2, 10, 10, "b"))
+    pages = sp._tess_tsv_pages(out, 2)
+    assert [d["text"] for d in pages] == [["a"], ["b"]]
+
+
+@pytest.mark.parametrize("rows,n", [
+    ((page(1),), 2),                      # short output
+    ((page(1), page(2), page(3)), 2),     # extra page
+    ((page(1), page(3)), 2),              # misaligned page numbers
+    ((), 1),                              # nothing at all
+])
+def test_page_count_mismatch_raises(rows, n):
+    with pytest.raises(RuntimeError):
+        sp._tess_tsv_pages(tsv(*rows), n)
@@ -0,0 +1,48 @@
+"""Line grouping on fixed word layouts (mid-y of each word, 3508px page -> y_tol 70)."""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import super_pipeline as sp  # noqa: E402
+
+PAGE_H = 3508
+
+
+def word(text, x, mid_y, h=20):
+    return {"text": text, "bbox": sp.quad_from_xywh(x, mid_y - h//2, 40, h)}
+
+
+def texts(lines):
+    return [[it["text"] for it in ln["items"]] for ln in lines]
+
+
+def test_running_median_keeps_drifting_line_together():
+    # c is 100px below a but within y_tol of the line's median (130) once b has joined
+    lines = sp.group_by_lines([word("c", 0, 200), word("a", 100, 100), word("b", 50, 160)], PAGE_H)
+    assert texts(lines) == [["c", "b", "a"]]
+    assert lines[0]["y"] == 160 and lines[0]["y_vals"] == [100, 160, 200]
+
+
+def test_words_beyond_the_median_start_a_new_line():
+    # c joins (65px from the median of a, b), d is 110px below the median of a, b, c
+    items = [word("a", 0, 100), word("b", 60, 150), word("c", 0, 190), word("d", 60, 260), word("e", 0, 400)]
+    lines = sp.group_by_lines(items, PAGE_H)
+    assert texts(lines) == [["a", "c", "b"], ["d"], ["e"]]
+    assert [ln["y"] for ln in lines] == [150, 260, 400]
+
+
+def test_even_line_median_and_left_to_right_order():
+    items = [word("r", 300, 101), word("l", 10, 100), word("m", 150, 104), word("z", 500, 106)]
+    lines = sp.group_by_lines(items, PAGE_H)
+    assert texts(lines) == [["l", "m", "r", "z"]]
+    assert lines[0]["y"] == 102
+
+
+def test_small_pages_use_the_minimum_tolerance():
+    # 300px page: 2% is 6px, so the 10px floor applies
+    lines = sp.group_by_lines([word("a", 0, 50), word("b", 0, 60), word("c", 0, 71)], 300)
+    assert texts(lines) == [["a", "b"], ["c"]]
+
+
+def test_no_items():
+    assert sp.group_by_lines([], PAGE_H) == []
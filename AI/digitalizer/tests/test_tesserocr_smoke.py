@@ -0,0 +1,33 @@
+"""Smoke test for the optional tesserocr fast path (skipped when tesserocr or eng data is missing)."""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+tesserocr = pytest.importorskip("tesserocr")
+import super_pipeline as sp  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def api():
+    if "eng" not in tesserocr.get_languages()[1]:
+        pytest.skip("eng.traineddata not installed")
+    return sp.get_tess_api("eng", sp.DEFAULT_TESS_CONFIG)
+
+
+def test_handle_uses_config_modes(api):
+    psm, _, _ = sp.parse_tess_config(sp.DEFAULT_TESS_CONFIG)
+    assert api.GetPageSegMode() == psm
+    assert sp.get_tess_api("eng", sp.DEFAULT_TESS_CONFIG) is api
+
+
+def test_page_and_stamp_ocr_run(api):
+    from PIL import Image
+    blank = Image.new("RGB", (400, 200), "white")
+    assert sp.ocr_items_from_image(blank, lang="eng", api=api) == []
+    assert api.GetPageSegMode() == sp.parse_tess_config(sp.DEFAULT_TESS_CONFIG)[0]
+    data = sp.tess_image_to_data(blank, lang="eng", api=api, config="--psm 3")
+    assert api.GetPageSegMode() == 3
+    assert data["text"] == []
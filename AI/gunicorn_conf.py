@@ -0,0 +1,20 @@
+# Gunicorn settings for the document API (server.py).
+# Run from the AI/ folder:
+#   gunicorn -c gunicorn_conf.py server:app
+# Each request mostly waits on the Gemini round-trip, so gevent workers let one
+# process keep many uploads in flight instead of serializing them.
+import os
+
+bind = os.getenv("BIND", "0.0.0.0:5000")
+workers = int(os.getenv("WEB_CONCURRENCY", "4"))
+worker_class = "gevent"
+worker_connections = 100
+# Gemini calls on large scans can take a while
+timeout = 120
+
+
+def post_worker_init(worker):
+    # google-generativeai talks gRPC: make its I/O cooperative with gevent's
+    # patched sockets (runs after the worker has monkey-patched)
+    import grpc.experimental.gevent as grpc_gevent
+    grpc_gevent.init_gevent()
@@ -1,11 +1,19 @@
 import os
+import re
 import json
-from flask import Flask, request, jsonify, render_template_string
+from flask import Flask, request, jsonify
 from dotenv import load_dotenv
 import google.generativeai as genai
+from google.api_core import exceptions as google_exceptions
 from PIL import Image
 import fitz  # PyMuPDF
-import io
+
+# Faster JSON parsing when available (orjson.JSONDecodeError subclasses json.JSONDecodeError)
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
 
 # --- Initialization ---
 load_dotenv()
@@ -14,6 +22,13 @@ app = Flask(__name__)
 from flask_cors import CORS
 CORS(app, resources={r"/*": {"origins": "*"}})
 
+# Uploader page, read once at startup from next to this file (None if it is missing)
+try:
+    with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'index.html'), 'r', encoding='utf-8') as _f:
+        _INDEX_HTML = _f.read()
+except OSError:
+    _INDEX_HTML = None
+
 # Configure the Gemini API
 try:
     genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
@@ -24,6 +39,13 @@ except Exception as e:
     print(f"Error configuring Gemini API: {e}")
     model = None
 
+# Upper bound on one Gemini round-trip, so a stalled call cannot pin a worker connection
+# (kept below the gunicorn worker timeout)
+GEMINI_TIMEOUT = float(os.getenv("GEMINI_TIMEOUT", "90"))
+
+# Gemini gains nothing from pixels beyond ~1568px on the long side; larger uploads only add tokens and latency
+MAX_IMAGE_SIDE = 1568
+
 # --- The Ultimate System Prompt ---
 # This prompt instructs the model to behave as an expert, extract specific fields,
 # generate a summary, and return everything in a clean JSON format.
@@ -58,15 +80,21 @@ The JSON object must contain two top-level keys: "extraction_result" and "summar
 2.  The "summary" key must contain a concise, human-readable paragraph summarizing the document. The summary should state who the claim is for, their location, the size of the land, and the key dependents mentioned.
 """
 
+# Markdown code fence the model sometimes wraps its JSON in (```json ... ```)
+_JSON_FENCE = re.compile(r"^```(?:json)?\s*|\s*```\s*$", re.S)
+
 # --- Helper Function for PDF to Image Conversion ---
 def pdf_to_image(pdf_bytes):
     """Converts the first page of a PDF file into a PIL Image."""
     try:
-        pdf_document = fitz.open(stream=pdf_bytes, filetype="pdf")
-        # Process only the first page for speed, as FRA forms are often single-page
-        page = pdf_document.load_page(0)
-        pix = page.get_pixmap(dpi=300)
-        img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
+        with fitz.open(stream=pdf_bytes, filetype="pdf") as pdf_document:
+            # Process only the first page for speed, as FRA forms are often single-page
+            page = pdf_document.load_page(0)
+            # 150 DPI (~1275x1650 for Letter, 1240x1754 for A4) is close to the model's image budget
+            pix = page.get_pixmap(dpi=150, alpha=False)
+            # samples_mv is a view of the pixmap memory, so frombytes makes the only copy (pix.samples
+            # would copy to bytes first; frombuffer cannot share RGB memory and copies as well)
+            img = Image.frombytes("RGB", (pix.width, pix.height), pix.samples_mv)
         return img
     except Exception as e:
         print(f"Error converting PDF to image: {e}")
@@ -86,24 +114,30 @@ def process_document():
         return jsonify({"error": "No file selected"}), 400
 
     try:
-        file_bytes = file.read()
         image = None
 
         if file.mimetype.startswith('image/'):
-            image = Image.open(io.BytesIO(file_bytes))
+            # Decode straight from the upload stream (no extra bytes copy)
+            image = Image.open(file.stream)
+            image.load()
         elif file.mimetype == 'application/pdf':
+            file_bytes = file.read()
             image = pdf_to_image(file_bytes)
+            del file_bytes
             if image is None:
                 return jsonify({"error": "Failed to convert PDF to image."}), 500
         else:
             return jsonify({"error": "Unsupported file type. Please upload an image or PDF."}), 400
-        
+
+        if max(image.size) > MAX_IMAGE_SIDE:
+            image.thumbnail((MAX_IMAGE_SIDE, MAX_IMAGE_SIDE), Image.LANCZOS)
+
         # Call the Gemini API
-        response = model.generate_content([SYSTEM_PROMPT, image])
+        response = model.generate_content([SYSTEM_PROMPT, image], request_options={"timeout": GEMINI_TIMEOUT})
         
         # Clean and parse the JSON response from the model
-        response_text = response.text.strip().replace("```json", "").replace("```", "")
-        result_json = json.loads(response_text)
+        response_text = _JSON_FENCE.sub("", response.text.strip())
+        result_json = _json_loads(response_text)
 
         # Reconstruct the response to match the user's desired final format
         final_output = {
@@ -121,6 +155,8 @@ def process_document():
 
         return jsonify(final_output)
 
+    except google_exceptions.DeadlineExceeded:
+        return jsonify({"error": f"Gemini did not respond within {GEMINI_TIMEOUT:.0f}s."}), 504
     except json.JSONDecodeError:
         return jsonify({"error": "Failed to parse JSON from AI model. Raw response: " + response.text}), 500
     except Exception as e:
@@ -128,12 +164,17 @@ def process_document():
         return jsonify({"error": str(e)}), 500
 
 # --- Simple HTML Frontend Route ---
-# This serves the uploader page from a string directly within the Python script
+# This serves the uploader page cached at startup (static HTML, no templating)
 @app.route('/', methods=['GET'])
 def index():
-    return render_template_string(open('index.html').read())
+    if _INDEX_HTML is None:
+        return "index.html not found", 404
+    return _INDEX_HTML
 
 # --- Run the App ---
+# Production: serve with gunicorn + gevent from this folder
+#   gunicorn -c gunicorn_conf.py server:app
+# The block below is the local development server only (single process).
 if __name__ == '__main__':
-    # Makes the server accessible on your local network
-    app.run(host='0.0.0.0', port=5000, debug=True)
\ No newline at end of file
+    # Makes the server accessible on your local network; set FLASK_DEBUG=1 for the debugger/reloader
+    app.run(host='0.0.0.0', port=5000, debug=os.getenv("FLASK_DEBUG") == "1")
\ No newline at end of file